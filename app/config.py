@@ -1,11 +1,12 @@
+from pydantic import Field
 from pydantic_settings import BaseSettings
-from functools import lru_cache
+from functools import cached_property
 from pathlib import Path
-import os
+from typing import Optional
 import logging
 
-# Set up logging
-logging.basicConfig(level=logging.INFO)
+from .env import ENV
+
 logger = logging.getLogger(__name__)
 
 class Settings(BaseSettings):
@@ -13,44 +14,61 @@ class Settings(BaseSettings):
     azure_client_id: str
     azure_client_secret: str
     azure_tenant_id: str
-    
-    # Base URL configuration with Railway support
-    app_base_url: str = "http://localhost:8000"  # Default to local development URL
-    
+
     # Other settings
     log_file: str = "search_results.log"
     token_path: str = str(Path("tokens").absolute())  # Absolute path to token directory
-    
+
+    # Persist webhook payloads/notifications/messages to the logs/ event log.
+    # Off by default so production webhook handling does no local disk I/O.
+    debug_persist_webhooks: bool = False
+
+    # APP_BASE_URL from the environment or .env; the app_base_url property
+    # below falls back to this outside Railway. Declared as a field (under a
+    # non-clashing name) so a dotenv-only APP_BASE_URL still loads instead of
+    # being rejected as a forbidden extra.
+    app_base_url_override: Optional[str] = Field(default=None, alias='app_base_url')
+
     class Config:
         env_file = ".env"
         case_sensitive = False
 
-    def __init__(self, **kwargs):
-        super().__init__(**kwargs)
-        
-        # Set base URL based on environment
-        if os.getenv('RAILWAY_ENVIRONMENT_NAME'):
+    @cached_property
+    def app_base_url(self) -> str:
+        """Base URL for the app, resolved once on first access.
+
+        Uses the Railway public domain when running on Railway, otherwise the
+        local development URL.
+        """
+        env_name = ENV.railway_environment_name
+        if env_name:
             # We're in Railway
-            env_name = os.getenv('RAILWAY_ENVIRONMENT_NAME')
-            public_domain = os.getenv('RAILWAY_PUBLIC_DOMAIN')
-            
+            public_domain = ENV.railway_public_domain
+
             if not public_domain:
                 error_msg = f"RAILWAY_PUBLIC_DOMAIN not set in Railway environment: {env_name}"
                 logger.error(error_msg)
                 raise ValueError(error_msg)
-                
-            self.app_base_url = f"https://{public_domain}"
-            logger.info(f"Using Railway domain for {env_name} environment: {self.app_base_url}")
-        else:
-            # Local development
-            logger.info("Using local development URL: http://localhost:8000")
-            
-        # Log environment info
-        logger.info(f"Current environment: {os.getenv('RAILWAY_ENVIRONMENT_NAME', 'local')}")
-        logger.info(f"Project name: {os.getenv('RAILWAY_PROJECT_NAME', 'local')}")
-        logger.info(f"Service name: {os.getenv('RAILWAY_SERVICE_NAME', 'local')}")
-
-@lru_cache()
+
+            base_url = f"https://{public_domain}"
+            logger.debug(f"Using Railway domain for {env_name} environment: {base_url}")
+            return base_url
+
+        # Local development
+        base_url = self.app_base_url_override or ENV.app_base_url or 'http://localhost:8000'
+        logger.debug(f"Using local development URL: {base_url}")
+        return base_url
+
+_settings: Optional[Settings] = None
+
 def get_settings() -> Settings:
-    """Get cached settings instance"""
-    return Settings() 
\ No newline at end of file
+    """Get the process-wide settings instance.
+
+    A plain module-level singleton: the fast path is one global load and an
+    is-None check, with no cache-wrapper dispatch per call.
+    """
+    global _settings
+    settings = _settings
+    if settings is None:
+        settings = _settings = Settings()
+    return settings
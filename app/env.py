@@ -0,0 +1,34 @@
+import os
+from dataclasses import dataclass
+from typing import Optional
+
+@dataclass(frozen=True, slots=True)
+class Env:
+    """Immutable snapshot of the environment variables the app reads.
+
+    Taken once at import time so service construction reads plain attributes
+    instead of re-scanning os.environ.
+    """
+    railway_environment_name: Optional[str]
+    railway_public_domain: Optional[str]
+    railway_api_token: Optional[str]
+    railway_project_id: Optional[str]
+    railway_environment_id: Optional[str]
+    railway_service_id: Optional[str]
+    azure_client_id: Optional[str]
+    azure_client_secret: Optional[str]
+    azure_tenant_id: Optional[str]
+    app_base_url: Optional[str]
+
+ENV = Env(
+    railway_environment_name=os.getenv('RAILWAY_ENVIRONMENT_NAME'),
+    railway_public_domain=os.getenv('RAILWAY_PUBLIC_DOMAIN'),
+    railway_api_token=os.getenv('RAILWAY_API_TOKEN'),
+    railway_project_id=os.getenv('RAILWAY_PROJECT_ID'),
+    railway_environment_id=os.getenv('RAILWAY_ENVIRONMENT_ID'),
+    railway_service_id=os.getenv('RAILWAY_SERVICE_ID'),
+    azure_client_id=os.getenv('AZURE_CLIENT_ID'),
+    azure_client_secret=os.getenv('AZURE_CLIENT_SECRET'),
+    azure_tenant_id=os.getenv('AZURE_TENANT_ID'),
+    app_base_url=os.getenv('APP_BASE_URL'),
+)
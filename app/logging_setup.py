@@ -0,0 +1,9 @@
+import logging
+
+def setup_logging(level: int = logging.INFO) -> None:
+    """Configure root logging once, at application startup.
+
+    Kept out of module import paths so importing app code never installs
+    handlers behind the server's (e.g. uvicorn's) own logging config.
+    """
+    logging.basicConfig(level=level)
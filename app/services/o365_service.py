@@ -1,7 +1,9 @@
 from typing import Optional, Dict, Any, Tuple
-import os
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
+from itertools import islice
+import time
 from dataclasses import dataclass
+from functools import cache
 from urllib.parse import urljoin
 import secrets
 import hashlib
@@ -10,13 +12,48 @@ from pathlib import Path
 import logging
 from O365 import Account
 from O365.utils.token import FileSystemTokenBackend
-from .railway_token_backend import RailwayTokenBackend
-from .subscription_backend import BaseSubscriptionBackend, FileSystemSubscriptionBackend, RailwaySubscriptionBackend
+from requests.adapters import HTTPAdapter
+from ..env import ENV
+from .railway_token_backend import CachedTokenBackend, RailwayTokenBackend
+from .subscription_backend import (
+    BaseSubscriptionBackend,
+    FileSystemSubscriptionBackend,
+    RailwaySubscriptionBackend,
+    expiration_timestamp,
+)
 
 # Set up logging
 logger = logging.getLogger(__name__)
 
-@dataclass
+# Error-log file handlers, keyed by path. Created once so the fd stays open
+# and writes are buffered instead of an open/write/close per error.
+_error_file_handlers: Dict[str, logging.Handler] = {}
+
+def _ensure_error_file_handler(log_file: str) -> None:
+    """Attach a persistent ERROR-level file handler for log_file (once)."""
+    if log_file in _error_file_handlers:
+        return
+    handler = logging.FileHandler(log_file, delay=True)
+    handler.setLevel(logging.ERROR)
+    handler.setFormatter(logging.Formatter('[%(asctime)s] %(message)s', '%Y-%m-%d %H:%M:%S'))
+    logger.addHandler(handler)
+    _error_file_handlers[log_file] = handler
+
+# Timestamp format for message summaries
+_RECEIVED_FORMAT = '%Y-%m-%d %H:%M:%S'
+
+_UTC = timezone.utc
+
+def _expiration_iso(days: int) -> str:
+    """ISO-8601 UTC expiration string (Z suffix) for a subscription."""
+    expiration = datetime.now(_UTC) + timedelta(days=days)
+    return expiration.isoformat().replace('+00:00', 'Z')
+
+# Fields requested when fetching full message details
+_MESSAGE_SELECT = ('id,subject,body,from,toRecipients,ccRecipients,bccRecipients,'
+                   'receivedDateTime,hasAttachments,attachments,importance,categories')
+
+@dataclass(slots=True)
 class O365Config:
     """Configuration for O365 service with environment-specific settings."""
     client_id: str
@@ -26,27 +63,41 @@ class O365Config:
     scopes: list[str] = None
     auth_flow_type: str = 'authorization'
     environment: str = 'local'
+    # Derived in __post_init__
+    redirect_uri: str = None
+    webhook_uri: str = None
+
+    def __post_init__(self):
+        # Precompute the OAuth callback and webhook URLs once; they're read on
+        # every auth round-trip and subscription call.
+        self.redirect_uri = urljoin(self.base_url, '/auth/callback')
+        self.webhook_uri = urljoin(self.base_url, '/webhooks/messages')
 
     @classmethod
+    @cache
     def from_env(cls) -> 'O365Config':
-        """Create configuration from environment variables."""
-        environment = os.getenv('RAILWAY_ENVIRONMENT_NAME', 'local')
-        
+        """Create configuration from environment variables.
+
+        Cached: the environment doesn't change at runtime, so repeated
+        O365Service() constructions reuse the same config.
+        """
+        environment = ENV.railway_environment_name or 'local'
+
         # Get base URL from Railway if available, otherwise use local
         if environment != 'local':
-            base_url = f"https://{os.getenv('RAILWAY_PUBLIC_DOMAIN')}"
-            logger.info(f"Using Railway domain for {environment} environment: {base_url}")
+            base_url = f"https://{ENV.railway_public_domain}"
+            logger.debug(f"Using Railway domain for {environment} environment: {base_url}")
         else:
-            base_url = os.getenv('APP_BASE_URL', 'http://localhost:8000')
-            logger.info(f"Using local development URL: {base_url}")
+            base_url = ENV.app_base_url or 'http://localhost:8000'
+            logger.debug(f"Using local development URL: {base_url}")
 
         # Include Mail.ReadWrite for subscriptions
         scopes = ['offline_access', 'Mail.Read', 'Mail.ReadWrite']
 
         config = cls(
-            client_id=os.getenv('AZURE_CLIENT_ID'),
-            client_secret=os.getenv('AZURE_CLIENT_SECRET'),
-            tenant_id=os.getenv('AZURE_TENANT_ID'),
+            client_id=ENV.azure_client_id,
+            client_secret=ENV.azure_client_secret,
+            tenant_id=ENV.azure_tenant_id,
             base_url=base_url,
             scopes=scopes,
             environment=environment
@@ -57,26 +108,19 @@ class O365Config:
         
         return config
 
-    @property
-    def redirect_uri(self) -> str:
-        """Get the full callback URL for OAuth."""
-        return urljoin(self.base_url, '/auth/callback')
-
-    @property
-    def webhook_uri(self) -> str:
-        """Get the full webhook URL for subscriptions."""
-        return urljoin(self.base_url, '/webhooks/messages')
-
 class O365Service:
     """Service for interacting with Office 365."""
 
+    __slots__ = ('config', 'token_backend', 'subscription_backend', '_account', '_code_verifier')
+
     def __init__(self, config: Optional[O365Config] = None):
         """Initialize the service with optional config."""
         self.config = config or O365Config.from_env()
         
         # Set up token backend based on environment
         if self.config.environment != 'local':
-            self.token_backend = RailwayTokenBackend()
+            # Cache token reads in RAM; the SDK re-reads the backend per call
+            self.token_backend = CachedTokenBackend(RailwayTokenBackend())
             self.subscription_backend = RailwaySubscriptionBackend()
         else:
             token_path = Path.home() / '.o365' / 'token.txt'
@@ -88,14 +132,14 @@ class O365Service:
 
     def _generate_code_verifier(self) -> str:
         """Generate a code verifier for PKCE."""
-        token = secrets.token_urlsafe(32)
-        return token
-        
+        return secrets.token_urlsafe(32)
+
     def _generate_code_challenge(self, code_verifier: str) -> str:
         """Generate a code challenge for PKCE."""
-        sha256_hash = hashlib.sha256(code_verifier.encode()).digest()
-        code_challenge = base64.urlsafe_b64encode(sha256_hash).decode().rstrip('=')
-        return code_challenge
+        # token_urlsafe output is pure ASCII, so one ascii encode suffices;
+        # strip the padding while it's still bytes to avoid a second copy.
+        sha256_hash = hashlib.sha256(code_verifier.encode('ascii')).digest()
+        return base64.urlsafe_b64encode(sha256_hash).rstrip(b'=').decode('ascii')
 
     @property
     def account(self) -> Account:
@@ -108,6 +152,26 @@ class O365Service:
                 scopes=self.config.scopes,
                 token_backend=self.token_backend
             )
+            # Widen the SDK session's connection pool so bursts of Graph
+            # calls (mailbox scan + per-message detail fetches) reuse
+            # keep-alive connections instead of opening new ones. The
+            # Connection creates its session lazily inside get_session(), so
+            # wrap it and remount on the session it returns, carrying over
+            # the retry config from the adapter the SDK installed.
+            connection = self._account.connection
+            sdk_get_session = connection.get_session
+
+            def get_session(*args, **kwargs):
+                session = sdk_get_session(*args, **kwargs)
+                current = session.get_adapter('https://')
+                session.mount('https://', HTTPAdapter(
+                    pool_connections=4,
+                    pool_maxsize=16,
+                    max_retries=current.max_retries,
+                ))
+                return session
+
+            connection.get_session = get_session
         return self._account
 
     def get_auth_url(self) -> Tuple[Optional[str], Optional[str]]:
@@ -179,14 +243,16 @@ class O365Service:
             query.received_date_time.greater_equal(datetime.now() - timedelta(days=days))
 
             logger.info(f"Searching messages from last {days} days in {self.config.environment} environment")
-            messages = []
-            for msg in mailbox.get_messages(query=query, limit=limit):
-                messages.append({
+            # islice caps the stream even if the SDK ignores limit
+            messages = [
+                {
                     "subject": msg.subject,
                     "from": msg.sender.address,
-                    "received": msg.received.strftime('%Y-%m-%d %H:%M:%S')
-                })
-            
+                    "received": msg.received.strftime(_RECEIVED_FORMAT)
+                }
+                for msg in islice(mailbox.get_messages(query=query, limit=limit), limit)
+            ]
+
             logger.info(f"Found {len(messages)} messages")
             return messages
 
@@ -196,17 +262,10 @@ class O365Service:
 
     def _log_error(self, message: str, error: Exception):
         """Log errors with timestamp and environment context."""
+        # The attached file handler persists errors to search_results_<env>.log
+        # without reopening the file per error.
+        _ensure_error_file_handler(f'search_results_{self.config.environment}.log')
         logger.error(f"[{self.config.environment}] {message}: {str(error)}")
-        
-        # Also log to file for persistence
-        timestamp = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-        log_file = f'search_results_{self.config.environment}.log'
-        
-        try:
-            with open(log_file, 'a') as f:
-                f.write(f'[{timestamp}] {message}: {str(error)}\n')
-        except Exception as e:
-            logger.error(f"Failed to write to log file {log_file}: {str(e)}") 
 
     def create_subscription(self, expiration_days: int = 7) -> Dict[str, Any]:
         """Create a new subscription for inbox messages.
@@ -229,8 +288,7 @@ class O365Service:
                 self._log_error("Failed to delete existing subscription", e)
                 
         # Create new subscription
-        expiration_days = min(expiration_days, 7)
-        expiration_date = (datetime.utcnow() + timedelta(days=expiration_days)).isoformat() + 'Z'
+        expiration_date = _expiration_iso(min(expiration_days, 7))
         
         subscription_data = {
             "changeType": "created,updated",
@@ -282,9 +340,8 @@ class O365Service:
                 raise ValueError("No subscription ID provided or stored")
             subscription_id = stored['id']
             
-        expiration_days = min(expiration_days, 7)
-        expiration_date = (datetime.utcnow() + timedelta(days=expiration_days)).isoformat() + 'Z'
-        
+        expiration_date = _expiration_iso(min(expiration_days, 7))
+
         update_data = {
             "expirationDateTime": expiration_date
         }
@@ -344,10 +401,7 @@ class O365Service:
             # Get the message with all properties including body and attachments
             response = self.account.connection.get(
                 url=f'/messages/{message_id}',
-                params={
-                    '$select': 'id,subject,body,from,toRecipients,ccRecipients,bccRecipients,' +
-                              'receivedDateTime,hasAttachments,attachments,importance,categories'
-                }
+                params={'$select': _MESSAGE_SELECT}
             )
             
             if response.status_code == 200:
@@ -370,20 +424,21 @@ class O365Service:
             None if no subscription or already expired
         """
         subscription = self.subscription_backend.get_subscription()
-        if not subscription or 'expirationDateTime' not in subscription:
-            return None
-            
-        try:
-            expiration = datetime.fromisoformat(subscription['expirationDateTime'].rstrip('Z'))
-            now = datetime.utcnow()
-            
-            if expiration > now:
-                return expiration - now
-            return None
-            
-        except Exception as e:
-            self._log_error("Error checking subscription expiration", e)
+        if not subscription:
             return None
+
+        # Prefer the timestamp precomputed at save time; fall back to parsing
+        # for subscriptions stored before it existed.
+        expires_ts = subscription.get('_expires_ts')
+        if expires_ts is None:
+            expires_ts = expiration_timestamp(subscription)
+            if expires_ts is None:
+                return None
+
+        remaining = expires_ts - time.time()
+        if remaining > 0:
+            return timedelta(seconds=remaining)
+        return None
             
     def should_renew_subscription(self, renewal_threshold: timedelta = timedelta(days=1)) -> bool:
         """Check if subscription should be renewed based on expiration time.
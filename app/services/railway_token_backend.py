@@ -1,12 +1,66 @@
 import json
-import os
+import threading
+import time
 from typing import Optional
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from O365.utils.token import BaseTokenBackend, Token
 
+from ..env import ENV
+
+try:
+    import orjson
+
+    def _json_dumps(obj) -> str:
+        return orjson.dumps(obj).decode()
+
+    _json_loads = orjson.loads
+    _payload_bytes = orjson.dumps
+except ImportError:  # pragma: no cover - orjson is in requirements
+    _json_dumps = json.dumps
+    _json_loads = json.loads
+
+    def _payload_bytes(obj) -> bytes:
+        return json.dumps(obj).encode()
+
+# (connect, read) timeout so a hung Railway endpoint can't block a worker
+_TIMEOUT = (3.05, 10)
+
+# GraphQL documents, built once at import time
+_VARIABLE_UPSERT_MUTATION = """
+mutation variableUpsert($input: VariableUpsertInput!) {
+    variableUpsert(input: $input)
+}
+"""
+
+_VARIABLES_QUERY = """
+query variables($environmentId: String!, $projectId: String!, $serviceId: String!) {
+    variables(
+        environmentId: $environmentId
+        projectId: $projectId
+        serviceId: $serviceId
+    )
+}
+"""
+
 class RailwayTokenBackend(BaseTokenBackend):
     """Token backend that stores tokens in Railway environment variables via GraphQL API."""
-    
+
+    # Shared session so every call reuses the same keep-alive connection pool
+    # and TLS session instead of paying a fresh TCP+TLS handshake per request.
+    _session: Optional[requests.Session] = None
+
+    # How long fetched variables may be served from memory before re-querying
+    # Railway. Writes update the cache in place so reads stay coherent.
+    _TTL = 30.0
+
+    # (monotonic timestamp, variables dict) - shared by all instances so the
+    # token and subscription backends read through one cache. The lock
+    # coalesces concurrent fetches into a single GraphQL call.
+    _cached_vars: Optional[tuple] = None
+    _fetch_lock = threading.Lock()
+
     def __init__(self, token_path: str = None):
         """Initialize the backend.
         
@@ -14,34 +68,42 @@ class RailwayTokenBackend(BaseTokenBackend):
             token_path: Ignored, kept for compatibility with BaseTokenBackend
         """
         super().__init__()
-        self.api_token = os.getenv('RAILWAY_API_TOKEN')
+        self.api_token = ENV.railway_api_token
         if not self.api_token:
             raise ValueError('RAILWAY_API_TOKEN environment variable is required')
-            
-        self.project_id = os.getenv('RAILWAY_PROJECT_ID')
-        self.environment_id = os.getenv('RAILWAY_ENVIRONMENT_ID')
-        self.service_id = os.getenv('RAILWAY_SERVICE_ID')
+
+        self.project_id = ENV.railway_project_id
+        self.environment_id = ENV.railway_environment_id
+        self.service_id = ENV.railway_service_id
         
         if not all([self.project_id, self.environment_id, self.service_id]):
             raise ValueError('Missing required Railway environment variables')
             
         self.api_url = 'https://backboard.railway.app/graphql/v2'
-        
-    def _get_headers(self) -> dict:
-        """Get headers for Railway API requests."""
-        return {
-            'Authorization': f'Bearer {self.api_token}',
-            'Content-Type': 'application/json',
-        }
-        
+
+        if RailwayTokenBackend._session is None:
+            session = requests.Session()
+            # Set once on the session; requests then skips per-call header
+            # construction and merging.
+            session.headers.update({
+                'Authorization': f'Bearer {self.api_token}',
+                'Content-Type': 'application/json',
+                'Connection': 'keep-alive',
+            })
+            retry = Retry(
+                total=3,
+                backoff_factor=0.2,
+                status_forcelist=[502, 503, 504],
+                allowed_methods=["POST"],
+            )
+            session.mount('https://', HTTPAdapter(
+                pool_connections=4, pool_maxsize=8, max_retries=retry
+            ))
+            RailwayTokenBackend._session = session
+
+
     def _variable_upsert(self, key: str, value: str):
         """Upsert a variable in Railway."""
-        mutation = """
-        mutation variableUpsert($input: VariableUpsertInput!) {
-            variableUpsert(input: $input)
-        }
-        """
-        
         variables = {
             "input": {
                 "name": key,
@@ -52,66 +114,124 @@ class RailwayTokenBackend(BaseTokenBackend):
             }
         }
         
-        response = requests.post(
+        response = self._session.post(
             self.api_url,
-            headers=self._get_headers(),
-            json={"query": mutation, "variables": variables}
+            data=_payload_bytes({"query": _VARIABLE_UPSERT_MUTATION, "variables": variables}),
+            timeout=_TIMEOUT
         )
         response.raise_for_status()
-        
+
+        # Keep the cached snapshot coherent with the write
+        if self._cached_vars is not None:
+            self._cached_vars[1][key] = value
+
     def _get_variables(self) -> dict:
-        """Get variables from Railway."""
-        query = """
-        query variables($environmentId: String!, $projectId: String!, $serviceId: String!) {
-            variables(
-                environmentId: $environmentId
-                projectId: $projectId
-                serviceId: $serviceId
-            )
-        }
+        """Get all variables from Railway, served from a short-lived cache.
+
+        One fetch per TTL window covers every key, so callers never pay a
+        per-key round-trip. Concurrent callers past the TTL coalesce on the
+        fetch lock: one performs the GraphQL call, the rest reuse its result.
         """
-        
+        now = time.monotonic()
+        cached = RailwayTokenBackend._cached_vars
+        if cached is not None and now - cached[0] < self._TTL:
+            return cached[1]
+
+        with RailwayTokenBackend._fetch_lock:
+            # Another caller may have refreshed while we waited on the lock
+            now = time.monotonic()
+            cached = RailwayTokenBackend._cached_vars
+            if cached is not None and now - cached[0] < self._TTL:
+                return cached[1]
+            return self._fetch_variables(now)
+
+    def _fetch_variables(self, now: float) -> dict:
+        """Fetch all variables from Railway and refresh the shared cache."""
         variables = {
             "environmentId": self.environment_id,
             "projectId": self.project_id,
             "serviceId": self.service_id
         }
         
-        response = requests.post(
+        response = self._session.post(
             self.api_url,
-            headers=self._get_headers(),
-            json={"query": query, "variables": variables}
+            data=_payload_bytes({"query": _VARIABLES_QUERY, "variables": variables}),
+            timeout=_TIMEOUT
         )
         response.raise_for_status()
-        return response.json().get('data', {}).get('variables', {})
+
+        variables = response.json().get('data', {}).get('variables', {})
+        RailwayTokenBackend._cached_vars = (now, variables)
+        return variables
 
     def load_token(self) -> Optional[Token]:
         """Load token from Railway environment variables."""
-        variables = self._get_variables()
-        token_data = variables.get('O365_TOKEN')
-        
+        token_data = self._get_variables().get('O365_TOKEN')
+
         if not token_data:
             return None
-            
+
         try:
-            token_dict = json.loads(token_data)
+            token_dict = _json_loads(token_data)
             return Token(token_dict)
-        except (json.JSONDecodeError, KeyError):
+        except (ValueError, KeyError):
             return None
-            
+
     def save_token(self, token: Token):
         """Save token to Railway environment variables."""
         if not isinstance(token, Token):
             raise ValueError('token must be an instance of Token')
-            
-        token_data = json.dumps(dict(token))
+
+        token_data = _json_dumps(dict(token))
         self._variable_upsert('O365_TOKEN', token_data)
-        
+
     def delete_token(self):
         """Delete token from Railway environment variables."""
         self._variable_upsert('O365_TOKEN', '')  # Railway API doesn't support deletion, so we set to empty
-        
+
     def check_token(self) -> bool:
         """Check if token exists in Railway environment variables."""
-        variables = self._get_variables()
-        return 'O365_TOKEN' in variables 
\ No newline at end of file
+        return bool(self._get_variables().get('O365_TOKEN'))
+
+class CachedTokenBackend(BaseTokenBackend):
+    """In-memory write-through cache around another token backend.
+
+    The O365 SDK consults its token backend on every API call; wrapping the
+    Railway backend keeps those reads in RAM for the life of the process.
+    Saves (including the SDK's own refresh flow) write through to the inner
+    backend, so the cache stays coherent with persisted state.
+    """
+
+    def __init__(self, inner: BaseTokenBackend):
+        super().__init__()
+        self._inner = inner
+        self._token: Optional[Token] = None
+        self._loaded = False
+
+    def load_token(self) -> Optional[Token]:
+        """Load the token, hitting the inner backend only on first read."""
+        if not self._loaded:
+            self._token = self._inner.load_token()
+            self._loaded = True
+        return self._token
+
+    def save_token(self, token: Token):
+        """Write the token through to the inner backend and cache it."""
+        self._inner.save_token(token)
+        self._token = token
+        self._loaded = True
+
+    def delete_token(self):
+        """Delete the token from the inner backend and the cache."""
+        self._inner.delete_token()
+        self._token = None
+        self._loaded = True
+
+    def check_token(self) -> bool:
+        """Check if a token exists, using the cached read."""
+        return self.load_token() is not None
+
+    def invalidate(self):
+        """Drop the cached token so the next read hits the inner backend."""
+        self._token = None
+        self._loaded = False
\ No newline at end of file
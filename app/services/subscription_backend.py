@@ -1,13 +1,36 @@
 import json
 import os
+import tempfile
 from typing import Optional, Dict, Any
 from abc import ABC, abstractmethod
-from datetime import datetime
+from datetime import datetime, timezone
 from pathlib import Path
 import logging
 
 logger = logging.getLogger(__name__)
 
+try:
+    import orjson
+
+    _dumps_bytes = orjson.dumps
+    _loads = orjson.loads
+except ImportError:  # pragma: no cover - orjson is in requirements
+    def _dumps_bytes(obj) -> bytes:
+        return json.dumps(obj).encode()
+
+    _loads = json.loads
+
+def expiration_timestamp(subscription_data: Dict[str, Any]) -> Optional[float]:
+    """Parse expirationDateTime into a POSIX timestamp, or None if absent/bad."""
+    expiration = subscription_data.get('expirationDateTime')
+    if not expiration:
+        return None
+    try:
+        parsed = datetime.fromisoformat(expiration.rstrip('Z'))
+        return parsed.replace(tzinfo=timezone.utc).timestamp()
+    except ValueError:
+        return None
+
 class BaseSubscriptionBackend(ABC):
     """Base class for subscription storage backends."""
     
@@ -28,41 +51,87 @@ class BaseSubscriptionBackend(ABC):
 
 class FileSystemSubscriptionBackend(BaseSubscriptionBackend):
     """Stores subscription data in a JSON file."""
-    
+
+    # Directories already created, so repeated backend construction skips the
+    # mkdir/stat syscall per instance.
+    _dirs_created = set()
+
     def __init__(self, subscription_path: Optional[str] = None):
         """Initialize with optional path."""
         if subscription_path:
             self.subscription_file = Path(subscription_path)
         else:
             self.subscription_file = Path.home() / '.o365' / 'subscription.json'
-            
-        self.subscription_file.parent.mkdir(exist_ok=True)
+
+        parent = self.subscription_file.parent
+        if parent not in self._dirs_created:
+            parent.mkdir(exist_ok=True)
+            self._dirs_created.add(parent)
+
+        # (mtime_ns, parsed) - reads skip the JSON parse while the file is unchanged
+        self._cache = None
+        # Last payload written, for turning idempotent saves into no-ops
+        self._last_payload = None
         
     def save_subscription(self, subscription_data: Dict[str, Any]) -> None:
         """Save subscription data to file."""
-        subscription_data['stored_at'] = datetime.utcnow().isoformat()
-        
-        with open(self.subscription_file, 'w') as f:
-            json.dump(subscription_data, f)
-            logger.info(f"Saved subscription data to {self.subscription_file}")
-            
+        subscription_data.setdefault('stored_at', datetime.now(timezone.utc).isoformat())
+
+        # Precompute the expiration as a timestamp so renewal checks are a
+        # float comparison instead of re-parsing the ISO string.
+        expires_ts = expiration_timestamp(subscription_data)
+        if expires_ts is not None:
+            subscription_data['_expires_ts'] = expires_ts
+
+        # Serialize once, write to a uniquely named temp file in the same
+        # directory, then rename into place. Readers (and concurrent reload
+        # workers) see either the old or the new file, never a partial one.
+        data = _dumps_bytes(subscription_data)
+        if data == self._last_payload:
+            # Byte-identical to what's already on disk; skip the write
+            return
+        with tempfile.NamedTemporaryFile(
+            dir=self.subscription_file.parent, delete=False, buffering=65536
+        ) as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(f.name, self.subscription_file)
+
+        self._cache = None
+        self._last_payload = data
+        logger.debug("Saved subscription data to %s", self.subscription_file)
+
     def get_subscription(self) -> Optional[Dict[str, Any]]:
         """Get subscription data from file."""
-        if not self.subscription_file.exists():
+        # A single stat doubles as the existence check and the cache key,
+        # avoiding the exists()+open() TOCTOU race.
+        try:
+            mtime_ns = self.subscription_file.stat().st_mtime_ns
+        except FileNotFoundError:
             return None
-            
+
+        if self._cache is not None and self._cache[0] == mtime_ns:
+            return self._cache[1]
+
         try:
-            with open(self.subscription_file, 'r') as f:
-                return json.load(f)
-        except json.JSONDecodeError:
-            logger.error(f"Failed to decode subscription data from {self.subscription_file}")
+            with open(self.subscription_file, 'rb') as f:
+                subscription = _loads(f.read())
+        except FileNotFoundError:
+            return None
+        except ValueError:
+            logger.exception("Failed to decode subscription data from %s", self.subscription_file)
             return None
-            
+
+        self._cache = (mtime_ns, subscription)
+        return subscription
+
     def delete_subscription(self) -> None:
         """Delete subscription file."""
-        if self.subscription_file.exists():
-            self.subscription_file.unlink()
-            logger.info(f"Deleted subscription file {self.subscription_file}")
+        self._cache = None
+        self._last_payload = None
+        self.subscription_file.unlink(missing_ok=True)
+        logger.debug("Deleted subscription file %s", self.subscription_file)
 
 class RailwaySubscriptionBackend(BaseSubscriptionBackend):
     """Stores subscription data in Railway environment variables."""
@@ -72,31 +141,47 @@ class RailwaySubscriptionBackend(BaseSubscriptionBackend):
         from .railway_token_backend import RailwayTokenBackend
         self.railway_backend = RailwayTokenBackend()
         self.subscription_key = 'O365_SUBSCRIPTION'
+
+        # (raw json str, parsed) - skips re-parsing while the stored value is unchanged
+        self._cache = None
         
     def save_subscription(self, subscription_data: Dict[str, Any]) -> None:
         """Save subscription data to Railway environment."""
-        subscription_data['stored_at'] = datetime.utcnow().isoformat()
+        subscription_data.setdefault('stored_at', datetime.now(timezone.utc).isoformat())
+
+        expires_ts = expiration_timestamp(subscription_data)
+        if expires_ts is not None:
+            subscription_data['_expires_ts'] = expires_ts
+
         self.railway_backend._variable_upsert(
             self.subscription_key,
-            json.dumps(subscription_data)
+            _dumps_bytes(subscription_data).decode()
         )
-        logger.info("Saved subscription data to Railway environment")
-        
+        self._cache = None
+        logger.debug("Saved subscription data to Railway environment")
+
     def get_subscription(self) -> Optional[Dict[str, Any]]:
         """Get subscription data from Railway environment."""
         variables = self.railway_backend._get_variables()
         subscription_json = variables.get(self.subscription_key)
-        
+
         if not subscription_json:
             return None
-            
+
+        if self._cache is not None and self._cache[0] == subscription_json:
+            return self._cache[1]
+
         try:
-            return json.loads(subscription_json)
-        except json.JSONDecodeError:
-            logger.error("Failed to decode subscription data from Railway environment")
+            subscription = _loads(subscription_json)
+        except ValueError:
+            logger.exception("Failed to decode subscription data from Railway environment")
             return None
-            
+
+        self._cache = (subscription_json, subscription)
+        return subscription
+
     def delete_subscription(self) -> None:
         """Delete subscription from Railway environment."""
+        self._cache = None
         self.railway_backend._variable_upsert(self.subscription_key, '')
-        logger.info("Deleted subscription data from Railway environment") 
\ No newline at end of file
+        logger.debug("Deleted subscription data from Railway environment") 
\ No newline at end of file
@@ -1,33 +1,63 @@
 from fastapi import FastAPI, Request, Depends, HTTPException, Response, BackgroundTasks
-from fastapi.responses import JSONResponse, RedirectResponse
+from fastapi.responses import ORJSONResponse, PlainTextResponse, RedirectResponse
 from app.services.o365_service import O365Service, O365Config
+from app.services.subscription_backend import expiration_timestamp
 from app.config import Settings, get_settings
+from app.logging_setup import setup_logging
 from typing import Annotated, Optional
-from functools import lru_cache
 import os
 import json
+import hmac
+import time
 import logging
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
 from pathlib import Path
 import asyncio
 from contextlib import asynccontextmanager
 
 # Set up logging
-logging.basicConfig(level=logging.INFO)
+setup_logging()
 logger = logging.getLogger(__name__)
 
+try:
+    import orjson
+
+    def _dumps_line(obj) -> bytes:
+        return orjson.dumps(obj, option=orjson.OPT_APPEND_NEWLINE)
+
+    _json_loads = orjson.loads
+except ImportError:  # pragma: no cover - orjson is in requirements
+    def _dumps_line(obj) -> bytes:
+        return json.dumps(obj).encode() + b"\n"
+
+    _json_loads = json.loads
+
 # Background task state
 subscription_check_task = None
+notification_writer_task = None
+write_queue: Optional[asyncio.Queue] = None
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Lifecycle manager for FastAPI application."""
+    logger.info("Starting up FastAPI application")
+    LOGS_DIR.mkdir(exist_ok=True)
+
+    # Invariant redirect, built once and shared across requests. Safe to
+    # reuse only because /auth/callback declares no BackgroundTasks: FastAPI
+    # attaches a request's background tasks to any Response the endpoint
+    # returns, so a shared instance in an endpoint with tasks would capture
+    # the first request's task list forever.
+    app.state.messages_redirect = RedirectResponse(url="/search/messages", status_code=303)
+
     # Start background tasks
-    global subscription_check_task
+    global subscription_check_task, notification_writer_task, write_queue
+    write_queue = asyncio.Queue(maxsize=10000)
+    notification_writer_task = asyncio.create_task(notification_writer(write_queue))
     subscription_check_task = asyncio.create_task(periodic_subscription_check())
-    
+
     yield
-    
+
     # Cleanup on shutdown
     if subscription_check_task:
         subscription_check_task.cancel()
@@ -36,13 +66,18 @@ async def lifespan(app: FastAPI):
         except asyncio.CancelledError:
             pass
 
+    # Flush any queued notification writes before exiting
+    if notification_writer_task:
+        await write_queue.put(None)
+        await notification_writer_task
+
     # Delete subscription on local dev server shutdown
     try:
         settings = get_settings()
         # Only cleanup subscription if we're running locally
         if settings.app_base_url.startswith(('http://localhost', 'https://localhost')):
             logger.info("Local dev server shutting down, cleaning up subscription...")
-            o365_service = get_o365_service(settings)
+            o365_service = get_o365_service()
             if o365_service.is_authenticated():
                 success = o365_service.delete_subscription()
                 if success:
@@ -52,53 +87,136 @@ async def lifespan(app: FastAPI):
     except Exception as e:
         logger.error(f"Error cleaning up subscription on shutdown: {str(e)}")
 
-app = FastAPI(lifespan=lifespan)
+# orjson serializes responses several times faster than the stdlib json
+# encoder behind the default JSONResponse
+app = FastAPI(lifespan=lifespan, default_response_class=ORJSONResponse)
 
-# Create logs directory if it doesn't exist
+# Created in lifespan so importing the module has no filesystem side effects
 LOGS_DIR = Path("logs")
-LOGS_DIR.mkdir(exist_ok=True)
 
 async def periodic_subscription_check():
     """Background task that periodically checks and renews subscriptions."""
     while True:
+        # Fallback cadence when there is no subscription (or the check fails)
+        sleep_seconds = 3600.0
         try:
-            # Get a new service instance
-            settings = get_settings()
-            o365_service = get_o365_service(settings)
-            
+            o365_service = get_o365_service()
+
             if o365_service.is_authenticated():
                 if o365_service.should_renew_subscription():
                     logger.info("Periodic check: Subscription needs renewal")
                     subscription = o365_service.ensure_subscription(
                         notification_url=o365_service.config.webhook_uri
                     )
+                    invalidate_subscription_cache()
                     logger.info(f"Subscription renewed, new expiration: {subscription['expirationDateTime']}")
                 else:
+                    subscription = get_cached_subscription(o365_service)
                     logger.debug("Periodic check: Subscription is valid")
-            
+
+                # Sleep until shortly before the expiration instead of a
+                # fixed hourly poll: wake 10 minutes early, never sooner
+                # than a minute out, never more than a day out.
+                expires_ts = None
+                if subscription:
+                    expires_ts = subscription.get('_expires_ts')
+                    if expires_ts is None:
+                        expires_ts = expiration_timestamp(subscription)
+                if expires_ts is not None:
+                    sleep_seconds = min(86400.0, max(60.0, expires_ts - time.time() - 600.0))
+
         except Exception as e:
             logger.error(f"Error in periodic subscription check: {str(e)}")
-            
-        # Check every hour
-        await asyncio.sleep(3600)  # 1 hour
-
-def save_notification_to_file(notification: dict):
-    """Save a webhook notification to a file with timestamp and message details."""
-    timestamp = datetime.utcnow().strftime('%Y%m%d_%H%M%S_%f')
-    notification_file = LOGS_DIR / f"notification_{timestamp}.json"
-    
-    # Add metadata to the notification
-    notification_data = {
-        "received_at": datetime.utcnow().isoformat(),
-        "notification": notification
-    }
-    
+
+        logger.debug("Next subscription check in %.0fs", sleep_seconds)
+        await asyncio.sleep(sleep_seconds)
+
+# Hourly append-only NDJSON event log: one inode and one journal commit per
+# flushed batch instead of a file per raw payload/notification/message
+_events_fd: Optional[int] = None
+_events_hour: Optional[str] = None
+
+def write_events(events: list):
+    """Append a batch of event dicts to the hourly NDJSON log.
+
+    The descriptor stays open across batches; each batch is one write plus
+    one fdatasync regardless of how many events it carries.
+    """
+    global _events_fd, _events_hour
     try:
-        with open(notification_file, 'w') as f:
-            json.dump(notification_data, f, indent=2)
-        logger.info(f"Saved notification to {notification_file}")
+        hour = datetime.now(timezone.utc).strftime('%Y%m%d%H')
+        if _events_fd is None or hour != _events_hour:
+            if _events_fd is not None:
+                os.close(_events_fd)
+            path = LOGS_DIR / f"events-{hour}.ndjson"
+            _events_fd = os.open(path, os.O_WRONLY | os.O_APPEND | os.O_CREAT | os.O_CLOEXEC, 0o644)
+            _events_hour = hour
+
+        os.write(_events_fd, b''.join(_dumps_line(event) for event in events))
+        os.fdatasync(_events_fd)
+        logger.debug("Appended %d events to events-%s.ndjson", len(events), hour)
     except Exception as e:
-        logger.error(f"Failed to save notification to file: {str(e)}")
+        logger.error(f"Failed to append events: {str(e)}")
+
+def close_event_log():
+    """Close the event log descriptor after the final flush."""
+    global _events_fd, _events_hour
+    if _events_fd is not None:
+        os.close(_events_fd)
+        _events_fd = None
+        _events_hour = None
+
+async def notification_writer(queue: asyncio.Queue):
+    """Drain queued event dicts and append them off the request path.
+
+    A burst of entries is collected with get_nowait so one worker-thread call
+    covers it; a None sentinel flushes the remainder and stops the task.
+    """
+    while True:
+        entry = await queue.get()
+        stop = entry is None
+        batch = [] if stop else [entry]
+        while True:
+            try:
+                next_entry = queue.get_nowait()
+            except asyncio.QueueEmpty:
+                break
+            if next_entry is None:
+                stop = True
+                break
+            batch.append(next_entry)
+
+        if batch:
+            await asyncio.to_thread(write_events, batch)
+        if stop:
+            close_event_log()
+            return
+
+# Current subscription cached in-process so webhook validation is a dict
+# lookup instead of a backend read per delivery. Mutating endpoints and the
+# renewal tasks invalidate it.
+_subscription_cache: Optional[dict] = None
+_subscription_cache_expires: float = 0.0
+_SUBSCRIPTION_CACHE_TTL = 60.0
+
+def get_cached_subscription(o365_service: O365Service) -> Optional[dict]:
+    """Return the current subscription, served from a short-lived cache."""
+    global _subscription_cache, _subscription_cache_expires
+    now = time.monotonic()
+    if _subscription_cache is not None and now < _subscription_cache_expires:
+        return _subscription_cache
+
+    subscription = o365_service.get_subscription()
+    if subscription:
+        _subscription_cache = subscription
+        _subscription_cache_expires = now + _SUBSCRIPTION_CACHE_TTL
+    return subscription
+
+def invalidate_subscription_cache():
+    """Drop the cached subscription after a create/renew/delete."""
+    global _subscription_cache, _subscription_cache_expires
+    _subscription_cache = None
+    _subscription_cache_expires = 0.0
 
 async def check_and_renew_subscription(o365_service: O365Service):
     """Background task to check subscription status and renew if needed."""
@@ -106,26 +224,35 @@ async def check_and_renew_subscription(o365_service: O365Service):
         if o365_service.should_renew_subscription():
             logger.info("Subscription needs renewal, attempting to renew...")
             subscription = o365_service.ensure_subscription()
+            invalidate_subscription_cache()
             logger.info(f"Subscription renewed, new expiration: {subscription['expirationDateTime']}")
     except Exception as e:
         logger.error(f"Failed to renew subscription: {str(e)}")
 
-@app.on_event("startup")
-async def startup_event():
-    """Run when the FastAPI app starts up."""
-    logger.info("Starting up FastAPI application")
-    LOGS_DIR.mkdir(exist_ok=True)
+@app.get("/healthz")
+async def healthz():
+    """Lightweight readiness probe; does no auth or I/O."""
+    return PlainTextResponse("ok")
+
+_o365_service: Optional[O365Service] = None
 
-@lru_cache()
-def get_o365_service(settings: Annotated[Settings, Depends(get_settings)]) -> O365Service:
-    """Dependency injection for O365Service"""
-    config = O365Config(
-        client_id=settings.azure_client_id,
-        client_secret=settings.azure_client_secret,
-        tenant_id=settings.azure_tenant_id,
-        base_url=settings.app_base_url
-    )
-    return O365Service(config)
+def get_o365_service() -> O365Service:
+    """Dependency injection for the O365Service singleton.
+
+    The previous lru_cache keyed on the Settings instance never hit (Settings
+    is unhashable), so a fresh service was built on every request.
+    """
+    global _o365_service
+    if _o365_service is None:
+        settings = get_settings()
+        config = O365Config(
+            client_id=settings.azure_client_id,
+            client_secret=settings.azure_client_secret,
+            tenant_id=settings.azure_tenant_id,
+            base_url=settings.app_base_url
+        )
+        _o365_service = O365Service(config)
+    return _o365_service
 
 @app.get("/search/messages")
 async def search_messages_endpoint(
@@ -146,15 +273,15 @@ async def search_messages_endpoint(
             )
         
         messages = o365_service.search_recent_messages()
-        return JSONResponse({
+        return {
             "status": "success",
             "data": messages
-        })
-    except Exception as e:
-        raise HTTPException(
-            status_code=500,
-            detail=str(e)
-        )
+        }
+    except HTTPException:
+        raise
+    except Exception:
+        logger.exception("Error searching messages")
+        raise HTTPException(status_code=500, detail="Internal server error")
 
 @app.get("/auth/callback")
 async def auth_callback(
@@ -173,42 +300,47 @@ async def auth_callback(
         result = o365_service.handle_auth_callback(auth_response_url)
         
         if result:
-            # Redirect back to the messages endpoint now that we're authenticated
-            return RedirectResponse(
-                url="/search/messages",
-                status_code=303  # See Other - for changing from GET to GET
-            )
+            # Redirect back to the messages endpoint now that we're
+            # authenticated; 303 See Other, shared prebuilt instance
+            return request.app.state.messages_redirect
         else:
             raise HTTPException(
                 status_code=401,
                 detail="Authentication failed"
             )
-    except Exception as e:
-        raise HTTPException(
-            status_code=500,
-            detail=f"Error in callback: {str(e)}"
-        )
+    except HTTPException:
+        raise
+    except Exception:
+        logger.exception("Error in auth callback")
+        raise HTTPException(status_code=500, detail="Internal server error")
 
 @app.post("/webhooks/messages")
 async def handle_webhook(
     request: Request,
     response: Response,
     background_tasks: BackgroundTasks,
-    o365_service: Annotated[O365Service, Depends(get_o365_service)]
+    o365_service: Annotated[O365Service, Depends(get_o365_service)],
+    settings: Annotated[Settings, Depends(get_settings)]
 ):
     """Handle incoming webhook notifications from Microsoft Graph."""
+    # Events produced while handling this webhook, appended to the NDJSON
+    # log in one batch instead of blocking the event loop per file. With
+    # debug_persist_webhooks off (the production default) nothing touches
+    # local disk; a count stands in for the persisted events.
+    persist = settings.debug_persist_webhooks
+    pending_events = []
+    events_seen = 0
     try:
         # Get the raw request body
         body = await request.body()
-        data = json.loads(body)
-        
-        # Save the raw webhook data first
-        timestamp = datetime.utcnow().strftime('%Y%m%d_%H%M%S_%f')
-        raw_file = LOGS_DIR / f"webhook_raw_{timestamp}.json"
-        with open(raw_file, 'w') as f:
-            json.dump(data, f, indent=2)
-        logger.info(f"Saved raw webhook data to {raw_file}")
-        
+        data = _json_loads(body)
+
+        # Timestamp once per webhook
+        received_iso = datetime.now(timezone.utc).isoformat()
+        events_seen += 1
+        if persist:
+            pending_events.append({"kind": "webhook_raw", "ts": received_iso, "data": data})
+
         # Handle validation request first (doesn't require subscription check)
         validation_token = request.query_params.get('validationToken')
         if validation_token:
@@ -217,7 +349,7 @@ async def handle_webhook(
             return validation_token
             
         # Get stored subscription to verify clientState
-        subscription = o365_service.get_subscription()
+        subscription = get_cached_subscription(o365_service)
         if not subscription:
             logger.error("No subscription found for webhook validation")
             raise HTTPException(status_code=404, detail="Subscription not found")
@@ -226,49 +358,84 @@ async def handle_webhook(
         if data.get('lifecycleEvent'):
             logger.info(f"Received lifecycle event: {data['lifecycleEvent']}")
             o365_service.handle_lifecycle_event(data)
+            invalidate_subscription_cache()
             return {"status": "success"}
             
-        # Validate the clientState for regular notifications
-        if data.get('clientState') != subscription.get('clientState'):
+        # Validate the clientState for regular notifications; compare_digest
+        # keeps the comparison constant-time instead of early-exiting on the
+        # first differing byte
+        provided_state = (data.get('clientState') or '').encode()
+        expected_state = (subscription.get('clientState') or '').encode()
+        if not hmac.compare_digest(provided_state, expected_state):
             logger.error("Invalid clientState in webhook notification")
             raise HTTPException(status_code=401, detail="Invalid clientState")
             
         # Process notifications
         notifications = data.get('value', [])
+        message_ids = []
         for notification in notifications:
-            # Save each notification separately
-            save_notification_to_file(notification)
-            
+            # Queue each notification separately
+            events_seen += 1
+            if persist:
+                pending_events.append({"kind": "notification", "ts": received_iso, "data": notification})
+
             # Log basic info
             logger.info(f"Received notification type: {notification.get('changeType')}")
-            
-            # Get message details if available
-            resource_data = notification.get('resourceData', {})
-            message_id = resource_data.get('id')
+
+            # Collect message ids to fetch details for
+            message_id = notification.get('resourceData', {}).get('id')
             if message_id:
-                try:
-                    # Get the full message details
-                    message = o365_service.get_message_details(message_id)
-                    if message:
-                        # Save full message details
-                        message_file = LOGS_DIR / f"message_{message_id}_{timestamp}.json"
-                        with open(message_file, 'w') as f:
-                            json.dump(message, f, indent=2)
-                        logger.info(f"Saved full message details to {message_file}")
-                except Exception as e:
-                    logger.error(f"Failed to get message details for {message_id}: {str(e)}")
-        
+                message_ids.append(message_id)
+
+        if message_ids:
+            # Fetch all message details concurrently: each Graph call runs in
+            # a worker thread, the semaphore caps in-flight requests, and a
+            # batch of K messages costs ~1 round trip of latency instead of K
+            semaphore = asyncio.Semaphore(16)
+
+            async def fetch_message(mid: str):
+                async with semaphore:
+                    return await asyncio.to_thread(o365_service.get_message_details, mid)
+
+            results = await asyncio.gather(
+                *(fetch_message(mid) for mid in message_ids),
+                return_exceptions=True
+            )
+            for message_id, message in zip(message_ids, results):
+                if isinstance(message, Exception):
+                    logger.error(f"Failed to get message details for {message_id}: {str(message)}")
+                elif message:
+                    # Queue full message details
+                    events_seen += 1
+                    if persist:
+                        pending_events.append({"kind": "message", "ts": received_iso,
+                                               "id": message_id, "data": message})
+
         # Schedule subscription check/renewal
         background_tasks.add_task(check_and_renew_subscription, o365_service)
-                
+
         return {"status": "success"}
         
-    except json.JSONDecodeError:
+    except HTTPException:
+        raise
+    except ValueError:
+        # Covers both orjson.JSONDecodeError and json.JSONDecodeError
         logger.error("Invalid JSON in webhook request")
         raise HTTPException(status_code=400, detail="Invalid JSON")
-    except Exception as e:
-        logger.error(f"Error processing webhook: {str(e)}")
+    except Exception:
+        logger.exception("Error processing webhook")
         raise HTTPException(status_code=500, detail="Internal server error")
+    finally:
+        # Hand the events to the background writer; the webhook response no
+        # longer waits on disk. Runs on error paths too so the raw payload
+        # is always captured.
+        for event in pending_events:
+            try:
+                write_queue.put_nowait(event)
+            except asyncio.QueueFull:
+                logger.warning(f"Write queue full, dropping a {event['kind']} event")
+        if not persist and events_seen:
+            logger.debug("Webhook produced %d events (persistence disabled)", events_seen)
 
 @app.post("/subscriptions/create")
 async def create_subscription(
@@ -280,10 +447,13 @@ async def create_subscription(
             raise HTTPException(status_code=401, detail="Authentication required")
             
         subscription = o365_service.create_subscription()
+        invalidate_subscription_cache()
         return subscription
-    except Exception as e:
-        logger.error(f"Error creating subscription: {str(e)}")
-        raise HTTPException(status_code=500, detail=str(e))
+    except HTTPException:
+        raise
+    except Exception:
+        logger.exception("Error creating subscription")
+        raise HTTPException(status_code=500, detail="Internal server error")
 
 @app.post("/subscriptions/renew")
 async def renew_subscription(
@@ -295,10 +465,13 @@ async def renew_subscription(
             raise HTTPException(status_code=401, detail="Authentication required")
             
         subscription = o365_service.renew_subscription()
+        invalidate_subscription_cache()
         return subscription
-    except Exception as e:
-        logger.error(f"Error renewing subscription: {str(e)}")
-        raise HTTPException(status_code=500, detail=str(e))
+    except HTTPException:
+        raise
+    except Exception:
+        logger.exception("Error renewing subscription")
+        raise HTTPException(status_code=500, detail="Internal server error")
 
 @app.delete("/subscriptions/delete")
 async def delete_subscription(
@@ -310,10 +483,13 @@ async def delete_subscription(
             raise HTTPException(status_code=401, detail="Authentication required")
             
         success = o365_service.delete_subscription()
+        invalidate_subscription_cache()
         return {"success": success}
-    except Exception as e:
-        logger.error(f"Error deleting subscription: {str(e)}")
-        raise HTTPException(status_code=500, detail=str(e))
+    except HTTPException:
+        raise
+    except Exception:
+        logger.exception("Error deleting subscription")
+        raise HTTPException(status_code=500, detail="Internal server error")
 
 @app.get("/subscriptions/current")
 async def get_subscription(
@@ -328,6 +504,8 @@ async def get_subscription(
         if not subscription:
             raise HTTPException(status_code=404, detail="No active subscription")
         return subscription
-    except Exception as e:
-        logger.error(f"Error getting subscription: {str(e)}")
-        raise HTTPException(status_code=500, detail=str(e))
\ No newline at end of file
+    except HTTPException:
+        raise
+    except Exception:
+        logger.exception("Error getting subscription")
+        raise HTTPException(status_code=500, detail="Internal server error")
\ No newline at end of file
@@ -1,19 +1,60 @@
+import logging
 import os
 import shutil
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path, WindowsPath
 import zipfile
 
+# Error log opened once (lazily, so clean runs create no file) instead of an
+# open/write/close cycle per failed member
+err_logger = logging.getLogger('move_docs.errors')
+err_logger.addHandler(logging.FileHandler('move_docs_errors.log', delay=True))
+err_logger.propagate = False
+
+# 1 MiB copy chunks; copyfileobj's 16 KiB default makes ~64x the syscalls
+_COPY_BUFFER = 1 << 20
+
+# Members up to this size are read and written in one shot; anything larger
+# streams through copyfileobj to bound memory
+_BULK_READ_LIMIT = 8 << 20
+
+def _extract_one(zip_path: str, file_info: zipfile.ZipInfo, target_file: str) -> None:
+    """Extract a single member to target_file.
+
+    Each worker opens its own ZipFile handle so the deflate stream state
+    isn't shared between threads.
+    """
+    with zipfile.ZipFile(zip_path, 'r') as zf:
+        if file_info.file_size <= _BULK_READ_LIMIT:
+            # .md files are small: one deflate call, one write syscall
+            data = zf.read(file_info)
+            with open(target_file, 'wb') as target:
+                target.write(data)
+        else:
+            with zf.open(file_info) as source, open(target_file, 'wb') as target:
+                shutil.copyfileobj(source, target, length=_COPY_BUFFER)
+
 def move_md_files_from_zip(zip_path: str, target_dir: str) -> None:
     """
     Extract and move .md files from a zip file to target_dir.
-    Files are processed one at a time to minimize memory usage.
+    Extractions run in a thread pool; the GIL is released around the
+    blocking file I/O so the copies overlap.
     Skips files that already exist in the target directory.
     """
     target_path = WindowsPath(target_dir)
     target_path.mkdir(parents=True, exist_ok=True)
     moved_count = 0
     skipped_count = 0
-    
+
+    # One directory read replaces a stat syscall per zip member
+    existing = {entry.name for entry in os.scandir(target_path)}
+
+    # Extended-length prefix computed once; per-file paths are then plain
+    # string formatting instead of three Path allocations per member
+    base = '\\\\?\\' + str(target_path.absolute())
+
+    # Collect the members to extract first, then fan the copies out
+    targets = []
     with zipfile.ZipFile(zip_path, 'r') as zip_ref:
         for file_info in zip_ref.infolist():
             if file_info.filename.lower().endswith('.md'):
@@ -21,31 +62,37 @@ def move_md_files_from_zip(zip_path: str, target_dir: str) -> None:
                     rel_path = file_info.filename.split('/content/')[1]
                 else:
                     rel_path = file_info.filename
-                
+
                 new_name = rel_path.replace('/', '_')
-                # Handle long paths by using the extended path prefix
-                target_file = WindowsPath('\\\\?\\' + str(target_path.absolute() / new_name))
-                
+
                 # Skip if file already exists
-                if target_file.exists():
+                if new_name in existing:
                     skipped_count += 1
                     continue
-                
-                try:
-                    # Create parent directory if it doesn't exist
-                    target_file.parent.mkdir(parents=True, exist_ok=True)
-                    
-                    # Extract and move the file
-                    with zip_ref.open(file_info) as source, open(str(target_file), 'wb') as target:
-                        shutil.copyfileobj(source, target)
-                    moved_count += 1
-                except Exception as e:
-                    # Log error for debugging but continue silently
-                    with open('move_docs_errors.log', 'a') as log:
-                        log.write(f"Error with {file_info.filename}: {str(e)}\n")
-                    continue
+                existing.add(new_name)
+
+                # Handle long paths by using the extended path prefix.
+                # Names are flattened with '_', so every target shares the
+                # one parent directory created at function entry - no
+                # per-file mkdir needed.
+                target_file = f"{base}\\{new_name}"
+                targets.append((file_info, target_file))
+
+    with ThreadPoolExecutor(max_workers=os.cpu_count()) as executor:
+        futures = {
+            executor.submit(_extract_one, zip_path, file_info, dest): file_info
+            for file_info, dest in targets
+        }
+        for future in as_completed(futures):
+            try:
+                future.result()
+                moved_count += 1
+            except Exception as e:
+                # Log error for debugging but continue silently
+                err_logger.error("Error with %s: %s", futures[future].filename, e)
+                continue
 
 if __name__ == "__main__":
     zip_path = r"C:\Users\AlexGoldsmith\Downloads\docs-main.zip"
     target = r"C:\Users\AlexGoldsmith\Documents\Software\Railway\v7_go\docs\github\docs2"
-    move_md_files_from_zip(zip_path, target) 
\ No newline at end of file
+    move_md_files_from_zip(zip_path, target)